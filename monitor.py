@@ -9,29 +9,99 @@ pages are handled in monitor_dynamic.py.
 
 from __future__ import annotations
 
-import difflib
+import hashlib
 import json
 import os
-import re
 import tempfile
-import shutil
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Optional, Sequence, Set, Union
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+    # BeautifulSoup is only the fallback when selectolax is missing.
+    from bs4 import BeautifulSoup
+
+try:
+    # Drop-in C implementation of difflib.SequenceMatcher.
+    from cdifflib import CSequenceMatcher as SequenceMatcher
+except ImportError:
+    from difflib import SequenceMatcher
+
+try:
+    from diff_match_patch import diff_match_patch
+except ImportError:
+    diff_match_patch = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 ROOT = Path(__file__).parent
 
 HASH_FILE = ROOT / "page_hashes.json"
 TEXT_FILE = ROOT / "page_texts.json"
+META_FILE = ROOT / "page_meta.json"
 
 NTFY_TOPIC_URL = os.environ.get("NTFY_TOPIC_URL", "").strip()
 DEBUG = os.environ.get("DEBUG", "").lower() == "true"
 
+# Hashes only detect change, so a fast non-cryptographic one will do.
+# Digests carry this prefix; a stored hash with another (or no) prefix
+# came from a different algorithm and is treated as a fresh baseline.
+HASH_ALGO = "xxh3_128" if xxhash is not None else "blake2b_128"
+
 MIN_DIFF_CHARS = 120
 MIN_DIFF_SNIPPETS = 1
-
+# Upper bound on diff_match_patch's search before it settles for a
+# coarser (still valid) diff.
+DIFF_TIMEOUT = 2.0
+# Changed regions smaller than this (old + new characters) are cheap
+# enough for SequenceMatcher, so diff_match_patch is only used above it.
+DMP_MIN_CHARS = 20_000
+# Changed regions larger than this, or of REWRITE_MIN_LINES+ lines with
+# too few lines in common, skip line alignment and are summarized from
+# the lines that appeared / disappeared, so a huge or redesigned page
+# cannot stall the run inside the matcher.
+MAX_DIFF_CHARS = 200_000
+REWRITE_SIMILARITY = 0.3
+REWRITE_MIN_LINES = 200
+
+# ntfy turns larger messages into attachments, so batched alerts are
+# split to stay under this.
+NTFY_MAX_BYTES = 4000
+NTFY_SEPARATOR = "\n\n---\n\n"
+
+# Bodies past this are truncated before hashing and parsing; listing and
+# notice pages are far smaller, and it bounds parse / diff cost.
+MAX_BODY_BYTES = 2_000_000
+
+# Fetching is network bound, so overlap requests instead of waiting on
+# each site in turn. State is still only touched from the main thread.
+MAX_WORKERS = 16
+
+# Accept-Encoding is left to requests/urllib3, which offers br on top of
+# gzip and deflate whenever brotli is importable and can decode it.
 WEB_HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64 "
@@ -43,6 +113,41 @@ WEB_HEADERS = {
 
 STATIC_URLS: list[str] = []
 
+# Pages where a diff snippet isn't worth keeping the full text around.
+# Only their hash is stored and a change sends a plain "content changed"
+# alert, which keeps page_texts.json down to the pages that need it.
+HASH_ONLY_URLS: Set[str] = set()
+
+# Subtrees that never hold page content. Dropping them before text
+# extraction keeps script / widget churn out of the hash and the diff.
+# header and footer stay: many CMS themes use them inside articles.
+BOILERPLATE_TAGS = ["script", "style", "noscript", "template", "svg", "iframe", "nav"]
+
+# One pooled session for every request so connections (and TLS sessions)
+# are reused across URLs on the same host and for the ntfy POSTs.
+SESSION = requests.Session()
+SESSION.headers.update(WEB_HEADERS)
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    # Also retry rate limiting and gateway errors; urllib3 never retries
+    # the non-idempotent ntfy POST on a status. Retry-After is ignored so
+    # a rate-limited site can't stall the run for however long it asks;
+    # only the short backoff applies.
+    max_retries=Retry(
+        total=2,
+        backoff_factor=0.3,
+        status_forcelist=[429, 502, 503, 504],
+        respect_retry_after_header=False,
+    ),
+)
+SESSION.mount("https://", _ADAPTER)
+SESSION.mount("http://", _ADAPTER)
+
+# Returned by fetch_page_text when the server answers a conditional GET
+# with 304, i.e. the page is unchanged since the stored validators.
+NOT_MODIFIED = object()
+
 
 def debug_print(msg: str) -> None:
     if DEBUG:
@@ -53,6 +158,8 @@ def load_json(path: Path) -> Dict[str, object]:
     if not path.exists():
         return {}
     try:
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         with path.open("r", encoding="utf-8") as f:
             return json.load(f)
     except Exception as e:
@@ -60,19 +167,28 @@ def load_json(path: Path) -> Dict[str, object]:
         return {}
 
 
+def dump_json(data: Dict[str, object]) -> bytes:
+    # orjson's indented output is byte-for-byte what json.dump(indent=2,
+    # ensure_ascii=False) writes, so the committed state files don't churn.
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
 def save_json(path: Path, data: Dict[str, object]) -> None:
     """Atomic JSON write."""
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
+        payload = dump_json(data)
         with tempfile.NamedTemporaryFile(
-            mode="w",
-            encoding="utf-8",
+            mode="wb",
             delete=False,
             dir=str(path.parent),
         ) as tmp:
-            json.dump(data, tmp, indent=2, ensure_ascii=False)
+            tmp.write(payload)
             tmp_path = Path(tmp.name)
-        shutil.move(str(tmp_path), str(path))
+        # Same directory, so this is an atomic rename over the old file.
+        os.replace(tmp_path, path)
     except Exception as e:
         print(f"[ERROR] Could not save {path}: {e}")
         try:
@@ -82,62 +198,268 @@ def save_json(path: Path, data: Dict[str, object]) -> None:
             pass
 
 
+def html_to_text(html: Union[str, bytes]) -> str:
+    """Flatten an HTML document to newline separated text."""
+    if LexborHTMLParser is not None:
+        # lexbor does the parse and the text walk in C; bytes input has
+        # its charset detected from a BOM or <meta charset>, str is used as is.
+        tree = LexborHTMLParser(html, encoding=True)
+        tree.strip_tags(BOILERPLATE_TAGS)
+        return tree.root.text(separator="\n") if tree.root else ""
+
+    soup = BeautifulSoup(html, HTML_PARSER)
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+    # stripped_strings skips the whitespace-only strings between tags that
+    # get_text would join in, only to be dropped again by normalization.
+    return "\n".join(soup.stripped_strings)
+
+
 def normalize_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    # str.split() splits on exactly the characters \s matches and drops the
+    # ends, so this equals re.sub(r"\s+", " ", text).strip() without the
+    # regex engine; it runs once per line of every fetched page.
+    return " ".join(text.split())
+
+
+def new_hasher():
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    # blake2b is the fastest hashlib digest without SHA extensions.
+    return hashlib.blake2b(digest_size=16)
+
+
+def hash_bytes(data: bytes) -> str:
+    hasher = new_hasher()
+    hasher.update(data)
+    return f"{HASH_ALGO}:{hasher.hexdigest()}"
 
 
 def hash_text(text: str) -> str:
-    import hashlib
+    return hash_bytes(text.encode("utf-8"))
+
 
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+def same_hash_algo(stored: str) -> bool:
+    return stored.startswith(HASH_ALGO + ":")
 
 
-def fetch_page_text(url: str) -> Optional[str]:
+def fetch_page_text(url: str, meta: Dict[str, str]) -> object:
+    """
+    Fetch url and return its normalized text, None on error, or
+    NOT_MODIFIED. meta holds the ETag / Last-Modified validators and the
+    raw body hash from the previous run and is updated in place.
+    """
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+
     try:
-        resp = requests.get(url, headers=WEB_HEADERS, timeout=45)
-        resp.raise_for_status()
+        # Short connect timeout so an unreachable host fails (and retries)
+        # fast; slow-but-alive servers still get the full read window.
+        resp = SESSION.get(url, headers=headers, timeout=(5, 45), stream=True)
+        # Inside the with so an error response is closed and its
+        # connection goes back to the pool.
+        with resp:
+            resp.raise_for_status()
+            etag = resp.headers.get("ETag")
+            last_modified = resp.headers.get("Last-Modified")
+            # Some servers ignore the conditional headers but still report
+            # the version we already have; stop before reading the body.
+            if resp.status_code == 304 or (
+                (etag or last_modified)
+                and etag == meta.get("etag")
+                and last_modified == meta.get("last_modified")
+            ):
+                debug_print(f"Not modified: {url}")
+                return NOT_MODIFIED
+
+            # Hash the body as it arrives; the chunks are only joined into
+            # one buffer when the page actually changed.
+            hasher = new_hasher()
+            chunks = []
+            size = 0
+            for chunk in resp.iter_content(chunk_size=65536):
+                room = MAX_BODY_BYTES - size
+                if len(chunk) > room:
+                    # Cut at exactly MAX_BODY_BYTES so the hash of an
+                    # oversized page doesn't depend on chunk boundaries.
+                    hasher.update(chunk[:room])
+                    chunks.append(chunk[:room])
+                    print(f"[WARN] {url} body truncated at {MAX_BODY_BYTES} bytes")
+                    break
+                hasher.update(chunk)
+                chunks.append(chunk)
+                size += len(chunk)
+            # Store the validators before the raw-hash check below, so a
+            # server that rotates its ETag over an unchanged body still gets
+            # the current one sent back next run.
+            for key, value in (("etag", etag), ("last_modified", last_modified)):
+                if value:
+                    meta[key] = value
+                else:
+                    meta.pop(key, None)
+            # Identical bytes mean identical text, so skip the HTML parse.
+            raw_hash = f"{HASH_ALGO}:{hasher.hexdigest()}"
+            if raw_hash == meta.get("raw_hash"):
+                debug_print(f"Raw body unchanged: {url}")
+                return NOT_MODIFIED
+            html = b"".join(chunks)
+            # The parser only sniffs a BOM or <meta charset> from bytes, so a
+            # charset declared in the HTTP header is applied here; without
+            # one the bytes go through and the markup decides.
+            if "charset=" in resp.headers.get("Content-Type", "").lower():
+                try:
+                    html = html.decode(resp.encoding, "replace")
+                except LookupError:
+                    pass
     except Exception as e:
         print(f"[ERROR] Fetching {url}: {e}")
         return None
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    raw_text = soup.get_text(separator="\n")
+    meta["raw_hash"] = raw_hash
+
+    raw_text = html_to_text(html)
 
     debug_print(f"Raw length for {url}: {len(raw_text)}")
 
-    lines = [ln.strip() for ln in raw_text.splitlines() if ln.strip()]
-    text = "\n".join(lines)
-    text = normalize_whitespace(text)
+    # Keep one line per text block; summarize_diff works line by line.
+    text = "\n".join(filter(None, map(normalize_whitespace, raw_text.splitlines())))
 
     debug_print(f"Normalized length for {url}: {len(text)}")
     return text
 
 
+def fetch_host_pages(pages: list[tuple[str, Dict[str, str]]]) -> Dict[str, object]:
+    """fetch_page_text for one host's (url, meta) pairs, in order, so that
+    site never sees more than one request at a time."""
+    return {url: fetch_page_text(url, meta) for url, meta in pages}
+
+
+def diff_opcodes(
+    old: Sequence[str], new: Sequence[str]
+) -> list[tuple[str, int, int, int, int]]:
+    """
+    difflib-style opcodes turning the line list old into new. Uses
+    SequenceMatcher for small inputs, whose matches read better, and
+    diff_match_patch (Myers O(ND) with a time limit) for large ones when
+    it is installed.
+    """
+    size = sum(map(len, old)) + sum(map(len, new))
+    if diff_match_patch is None or size < DMP_MIN_CHARS:
+        # Plain SequenceMatcher, never difflib.Differ: Differ's intraline
+        # fuzzy matching is cubic on pages with many similar lines.
+        # autojunk is off for small inputs: on listing pages the lines it
+        # would discard as "popular" (prices, "Apply now", unit labels) are
+        # exactly the ones worth aligning. Large inputs only get here without
+        # diff_match_patch, and keep the heuristic so repetitive pages up to
+        # MAX_DIFF_CHARS don't take seconds to match.
+        return SequenceMatcher(
+            None, old, new, autojunk=size >= DMP_MIN_CHARS
+        ).get_opcodes()
+
+    # diff_match_patch diffs strings, so map every distinct line to one
+    # character (its diff_linesToChars trick) and diff those.
+    codes: Dict[str, str] = {}
+    a = "".join(codes.setdefault(ln, chr(len(codes))) for ln in old)
+    b = "".join(codes.setdefault(ln, chr(len(codes))) for ln in new)
+
+    dmp = diff_match_patch()
+    dmp.Diff_Timeout = DIFF_TIMEOUT
+    diffs = dmp.diff_main(a, b, False)
+    dmp.diff_cleanupSemantic(diffs)
+
+    opcodes: list[tuple[str, int, int, int, int]] = []
+    i = j = 0
+    for op, data in diffs:
+        n = len(data)
+        if op == dmp.DIFF_EQUAL:
+            opcodes.append(("equal", i, i + n, j, j + n))
+            i += n
+            j += n
+        elif op == dmp.DIFF_DELETE:
+            opcodes.append(("delete", i, i + n, j, j))
+            i += n
+        elif opcodes and opcodes[-1][0] == "delete" and opcodes[-1][2] == i:
+            _, i1, i2, j1, _ = opcodes.pop()
+            opcodes.append(("replace", i1, i2, j1, j + n))
+            j += n
+        else:
+            opcodes.append(("insert", i, i, j, j + n))
+            j += n
+    return opcodes
+
+
 def summarize_diff(
     old_text: str,
     new_text: str,
     max_snippets: int = 5,
-    context_chars: int = 120,
+    context_lines: int = 2,
     max_chars: int = 1500,
 ) -> Optional[str]:
-    sm = difflib.SequenceMatcher(None, old_text, new_text)
+    # A plain comparison is a length check plus memcmp; no need to split
+    # and scan two identical pages.
+    if old_text == new_text:
+        return None
+
+    # Diff whole lines: a page has a few hundred lines but tens of
+    # thousands of characters, and the matcher is roughly quadratic.
+    old_lines = old_text.splitlines()
+    new_lines = new_text.splitlines()
+
+    # Between two polls usually only a few lines change, so strip the
+    # shared head and tail and only diff what lies between them.
+    lo = 0
+    limit = min(len(old_lines), len(new_lines))
+    while lo < limit and old_lines[lo] == new_lines[lo]:
+        lo += 1
+    old_hi, new_hi = len(old_lines), len(new_lines)
+    while old_hi > lo and new_hi > lo and old_lines[old_hi - 1] == new_lines[new_hi - 1]:
+        old_hi -= 1
+        new_hi -= 1
+    old_core = old_lines[lo:old_hi]
+    new_core = new_lines[lo:new_hi]
+
+    if not old_core and not new_core:
+        return None
+
     additions = []
     removals = []
 
-    for tag, i1, i2, j1, j2 in sm.get_opcodes():
+    # A page that was essentially rewritten (or is too big to align) is
+    # summarized by which lines came and went. The shared-line count, with
+    # multiplicity, is SequenceMatcher.quick_ratio's O(n) upper bound on
+    # similarity; small changed regions always get the aligned diff.
+    n_core = len(old_core) + len(new_core)
+    rewritten = n_core >= REWRITE_MIN_LINES and (
+        2 * sum((Counter(old_core) & Counter(new_core)).values()) / n_core
+        < REWRITE_SIMILARITY
+    )
+    too_large = max(sum(map(len, old_core)), sum(map(len, new_core))) > MAX_DIFF_CHARS
+    if too_large or rewritten:
+        old_seen, new_seen = set(old_core), set(new_core)
+        additions = [f"+ {ln}" for ln in new_core if ln not in old_seen and len(ln) >= 10]
+        removals = [f"- {ln[:160]}" for ln in old_core if ln not in new_seen and len(ln) >= 10]
+        opcodes = []
+    else:
+        opcodes = diff_opcodes(old_core, new_core)
+
+    for tag, i1, i2, j1, j2 in opcodes:
+        i1, i2, j1, j2 = i1 + lo, i2 + lo, j1 + lo, j2 + lo
         if tag == "equal":
             continue
 
         if tag in ("insert", "replace"):
-            seg = new_text[j1:j2].strip()
+            seg = " ".join(new_lines[j1:j2]).strip()
             if seg and len(seg) >= 10:
-                start = max(0, j1 - context_chars)
-                end = min(len(new_text), j2 + context_chars)
-                snippet = new_text[start:end].strip()
+                start = max(0, j1 - context_lines)
+                end = min(len(new_lines), j2 + context_lines)
+                snippet = " ".join(new_lines[start:end]).strip()
                 additions.append(f"+ {snippet}")
 
         if tag in ("delete", "replace"):
-            seg = old_text[i1:i2].strip()
+            seg = " ".join(old_lines[i1:i2]).strip()
             if seg and len(seg) >= 10:
                 removals.append(f"- {seg[:160]}")
 
@@ -159,33 +481,65 @@ def summarize_diff(
     return summary
 
 
-def send_ntfy_alert(url: str, diff_summary: str) -> None:
-    if not NTFY_TOPIC_URL:
-        print("[WARN] NTFY_TOPIC_URL not set - would have sent alert")
-        print(diff_summary)
-        return
-
-    body = f"Static site change detected:\n{url}\n\n{diff_summary}"
-
+def post_ntfy(title: str, body: str, label: str) -> None:
     headers = {
-        "Title": f"Static Site Change: {url}",
+        "Title": title,
         "Priority": "3",
         "Tags": "static,monitor",
     }
 
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             NTFY_TOPIC_URL,
             data=body.encode("utf-8"),
             headers=headers,
             timeout=20,
         )
         if 200 <= resp.status_code < 300:
-            print(f"[OK] Alert sent for {url}")
+            print(f"[OK] Alert sent for {label}")
         else:
-            print(f"[ERROR] ntfy returned {resp.status_code} for {url}")
+            print(f"[ERROR] ntfy returned {resp.status_code} for {label}")
     except Exception as e:
-        print(f"[ERROR] Sending ntfy alert for {url}: {e}")
+        print(f"[ERROR] Sending ntfy alert for {label}: {e}")
+
+
+def send_ntfy_alerts(alerts: list[tuple[str, str]]) -> None:
+    """
+    Send the (url, summary) pairs collected during a run. A single change
+    keeps the per-page format; several are packed into as few posts as
+    fit under ntfy's message size limit.
+    """
+    if not alerts:
+        return
+
+    if not NTFY_TOPIC_URL:
+        print("[WARN] NTFY_TOPIC_URL not set - would have sent alert")
+        for url, diff_summary in alerts:
+            print(f"{url}\n{diff_summary}")
+        return
+
+    if len(alerts) == 1:
+        url, diff_summary = alerts[0]
+        body = f"Static site change detected:\n{url}\n\n{diff_summary}"
+        post_ntfy(f"Static Site Change: {url}", body, url)
+        return
+
+    batches: list[list[str]] = [[]]
+    size = 0
+    for url, diff_summary in alerts:
+        entry = f"{url}\n\n{diff_summary}"
+        entry_size = len(entry.encode("utf-8")) + len(NTFY_SEPARATOR)
+        if batches[-1] and size + entry_size > NTFY_MAX_BYTES:
+            batches.append([])
+            size = 0
+        batches[-1].append(entry)
+        size += entry_size
+
+    for i, entries in enumerate(batches, 1):
+        title = f"Static Site Change: {len(entries)} pages"
+        if len(batches) > 1:
+            title += f" ({i}/{len(batches)})"
+        post_ntfy(title, NTFY_SEPARATOR.join(entries), f"{len(entries)} pages")
 
 
 def run_static_once() -> None:
@@ -195,39 +549,102 @@ def run_static_once() -> None:
 
     hash_state = load_json(HASH_FILE)
     text_state = load_json(TEXT_FILE)
+    meta_state = load_json(META_FILE)
+    # Serialized as loaded, to tell whether page_meta.json needs rewriting.
+    meta_before = dump_json(meta_state)
+    # Each state file is only rewritten when its own contents changed;
+    # page_texts.json holds the full text of every page.
+    texts_changed = False
+    hashes_changed = False
+    # Collected during the run and sent together at the end.
+    alerts: list[tuple[str, str]] = []
+
+    for url in HASH_ONLY_URLS:
+        if text_state.pop(url, None) is not None:
+            texts_changed = True
+
+    # dict.fromkeys drops repeated entries (keeping order) so a URL
+    # pasted into the list twice is still only fetched once.
+    urls = list(dict.fromkeys(STATIC_URLS))
+    # One pool job per host: a site's pages are fetched one after another,
+    # while different sites are fetched in parallel.
+    by_host: Dict[str, list[tuple[str, Dict[str, str]]]] = {}
+    for url in urls:
+        meta = meta_state.setdefault(url, {})
+        baseline = hash_state if url in HASH_ONLY_URLS else text_state
+        if url not in baseline:
+            # No baseline to fall back on, so force a full download.
+            meta.clear()
+        by_host.setdefault(urlparse(url).netloc, []).append((url, meta))
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        host_futures = {
+            host: pool.submit(fetch_host_pages, pages)
+            for host, pages in by_host.items()
+        }
+
+        # Handle results in list order rather than completion order so the
+        # log and the batched alert read the same way every run; the
+        # fetches themselves still overlap.
+        for url in urls:
+            print(f"[INFO] Checking {url}")
+            new_text = host_futures[urlparse(url).netloc].result()[url]
+            if new_text is None:
+                continue
+
+            if new_text is NOT_MODIFIED:
+                print(f"[NOCHANGE] {url} (not modified)")
+                continue
+
+            if url in HASH_ONLY_URLS:
+                new_hash = hash_text(new_text)
+                old_hash = hash_state.get(url)
+                if old_hash is None or not same_hash_algo(old_hash):
+                    print(f"[INIT] Baseline hash stored for {url}")
+                elif new_hash == old_hash:
+                    print(f"[NOCHANGE] {url}")
+                    continue
+                else:
+                    alerts.append((url, "Page content changed."))
+                hash_state[url] = new_hash
+                hashes_changed = True
+                continue
+
+            old_text = text_state.get(url)
+
+            if old_text is None:
+                print(f"[INIT] Baseline stored for {url}")
+                text_state[url] = new_text
+                hash_state[url] = hash_text(new_text)
+                texts_changed = hashes_changed = True
+                continue
+
+            if new_text == old_text:
+                print(f"[NOCHANGE] {url}")
+                continue
+
+            summary = summarize_diff(old_text, new_text)
+            if summary is None:
+                print(
+                    f"[INFO] {url}: content changed but diff not significant; "
+                    "updating baseline without alert"
+                )
+            else:
+                alerts.append((url, summary))
 
-    for url in STATIC_URLS:
-        print(f"[INFO] Checking {url}")
-        new_text = fetch_page_text(url)
-        if new_text is None:
-            continue
-
-        old_text = text_state.get(url)
-
-        if old_text is None:
-            print(f"[INIT] Baseline stored for {url}")
             text_state[url] = new_text
             hash_state[url] = hash_text(new_text)
-            continue
-
-        if new_text == old_text:
-            print(f"[NOCHANGE] {url}")
-            continue
-
-        summary = summarize_diff(old_text, new_text)
-        if summary is None:
-            print(
-                f"[INFO] {url}: content changed but diff not significant; "
-                "updating baseline without alert"
-            )
-        else:
-            send_ntfy_alert(url, summary)
+            texts_changed = hashes_changed = True
 
-        text_state[url] = new_text
-        hash_state[url] = hash_text(new_text)
+    send_ntfy_alerts(alerts)
 
-    save_json(TEXT_FILE, text_state)
-    save_json(HASH_FILE, hash_state)
+    if texts_changed:
+        save_json(TEXT_FILE, text_state)
+    if hashes_changed:
+        save_json(HASH_FILE, hash_state)
+    meta_state = {u: m for u, m in meta_state.items() if m}
+    if dump_json(meta_state) != meta_before:
+        save_json(META_FILE, meta_state)
 
 
 if __name__ == "__main__":
@@ -7,17 +7,47 @@ import json
 import os
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional, Set
+from typing import Dict, Optional, Set, Union
+from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+    # BeautifulSoup is only the fallback when selectolax is missing.
+    from bs4 import BeautifulSoup
 
 try:
     from playwright.sync_api import sync_playwright
 except ImportError:
     sync_playwright = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Renders are network bound, but every worker runs its own Chromium, so
+# keep this low enough for the runner's memory.
+MAX_WORKERS = 4
+
+# ntfy turns larger messages into attachments, so batched alerts are
+# split to stay under this.
+NTFY_MAX_BYTES = 4000
+NTFY_SEPARATOR = "\n\n---\n\n"
+
 # === FILES ===
 APT_FILE = "dynamic_apartments.json"
 TEXT_FILE = "dynamic_texts.json"
@@ -28,6 +58,17 @@ LAST_ALERT_FILE = "dynamic_last_alert.json"
 NTFY_TOPIC_URL = os.environ.get("NTFY_TOPIC_URL", "").strip()
 DEBUG = os.environ.get("DEBUG", "false").lower() in ("true", "1", "yes")
 
+# Only script and style bodies are dropped before text extraction. The
+# extractors were tuned against everything else on the rendered page, and
+# stored ids can come from nav menus or embedded frames.
+BOILERPLATE_TAGS = ["script", "style"]
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Shared session so several alerts in one run reuse the ntfy connection.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(max_retries=Retry(total=2, backoff_factor=0.3)))
+
 
 def debug_print(msg: str) -> None:
     if DEBUG:
@@ -39,46 +80,55 @@ def load_json(fname: str) -> Dict:
     if not p.exists():
         return {}
     try:
-        with p.open("r", encoding="utf-8") as f:
-            data = json.load(f)
-            if not isinstance(data, dict):
-                print(f"[WARN] {fname} not a dict, resetting")
-                return {}
-            return data
+        if orjson is not None:
+            data = orjson.loads(p.read_bytes())
+        else:
+            with p.open("r", encoding="utf-8") as f:
+                data = json.load(f)
+        if not isinstance(data, dict):
+            print(f"[WARN] {fname} not a dict, resetting")
+            return {}
+        return data
     except json.JSONDecodeError as e:
         print(f"[ERROR] {fname} parse error: {e}, resetting")
         return {}
 
 
-def save_json(fname: str, data: Dict) -> None:
-    with open(fname, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+def dump_json(data: Dict) -> bytes:
+    # Same bytes as json.dump(indent=2, ensure_ascii=False), just faster.
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
 
 
-def track_failure(url: str) -> None:
-    failures = load_json(FAILURE_FILE)
+def save_json(fname: str, data: Dict) -> None:
+    # Write to a sibling temp file and swap it in, so a run killed mid-write
+    # never leaves a truncated state file behind.
+    tmp = f"{fname}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(dump_json(data))
+    os.replace(tmp, fname)
+
+
+# Failure counts and cooldowns are loaded once per run by run_dynamic_once
+# and written back at the end, instead of re-reading and rewriting the
+# whole file for every URL.
+def track_failure(failures: Dict, url: str) -> None:
     failures[url] = failures.get(url, 0) + 1
-    save_json(FAILURE_FILE, failures)
 
 
-def reset_failure_count(url: str) -> None:
-    failures = load_json(FAILURE_FILE)
-    if url in failures:
-        del failures[url]
-        save_json(FAILURE_FILE, failures)
+def reset_failure_count(failures: Dict, url: str) -> bool:
+    return failures.pop(url, None) is not None
 
 
-def cooldown_seconds(url: str) -> float:
-    cooldowns = load_json(COOLDOWN_FILE)
+def cooldown_seconds(cooldowns: Dict, url: str) -> float:
     now = time.time()
     until = cooldowns.get(url, 0)
     return max(0.0, until - now)
 
 
-def set_cooldown(url: str, seconds: float) -> None:
-    cooldowns = load_json(COOLDOWN_FILE)
+def set_cooldown(cooldowns: Dict, url: str, seconds: float) -> None:
     cooldowns[url] = time.time() + seconds
-    save_json(COOLDOWN_FILE, cooldowns)
 
 
 def cleanup_playwright_tmp() -> None:
@@ -99,26 +149,35 @@ def cleanup_playwright_tmp() -> None:
         pass
 
 
-def normalize_whitespace(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+def html_to_text(html: Union[str, bytes]) -> str:
+    """Flatten an HTML document to newline separated text."""
+    if LexborHTMLParser is not None:
+        # lexbor does the parse and the text walk in C; bytes input has
+        # its charset detected from the markup like BeautifulSoup does.
+        tree = LexborHTMLParser(html, encoding=True)
+        tree.strip_tags(BOILERPLATE_TAGS)
+        return tree.root.text(separator="\n") if tree.root else ""
 
+    soup = BeautifulSoup(html, HTML_PARSER)
+    for tag in soup(BOILERPLATE_TAGS):
+        tag.decompose()
+    # stripped_strings skips the whitespace-only strings between tags that
+    # get_text would join in, only to be dropped again by normalization.
+    return "\n".join(soup.stripped_strings)
 
-def fetch_rendered_html(url: str, max_retries: int = 2) -> Optional[str]:
-    cooldowns = load_json(COOLDOWN_FILE)
-    now = time.time()
-    until = cooldowns.get(url, 0)
-    if now < until:
-        wait = until - now
-        print(f"[COOLDOWN] {url} on cooldown for {int(wait)}s, skipping")
-        return None
 
-    if sync_playwright is None:
-        print(f"[ERROR] playwright not installed, can't fetch {url}")
-        return None
+def normalize_whitespace(text: str) -> str:
+    # Same result as re.sub(r"\s+", " ", text).strip(): str.split() breaks
+    # on exactly the characters \s matches, and it runs in C without
+    # the regex engine over the whole rendered page.
+    return " ".join(text.split())
+
 
+def fetch_rendered_html(url: str, max_retries: int = 2) -> Optional[str]:
+    # Runs in a worker thread: each call drives its own Playwright instance
+    # and leaves cooldown / failure bookkeeping to run_dynamic_once.
     for attempt in range(1, max_retries + 1):
         try:
-            cleanup_playwright_tmp()
             with sync_playwright() as p:
                 browser = p.chromium.launch(headless=True)
                 page = browser.new_page(
@@ -136,7 +195,6 @@ def fetch_rendered_html(url: str, max_retries: int = 2) -> Optional[str]:
                 time.sleep(2 ** attempt)
             else:
                 print(f"[ERROR] All attempts failed for {url}: {e}")
-                set_cooldown(url, 300)
                 return None
 
 
@@ -145,13 +203,12 @@ def fetch_rendered_text(url: str) -> Optional[str]:
     if html is None:
         return None
 
-    soup = BeautifulSoup(html, "html.parser")
-    raw_text = soup.get_text(separator="\n")
+    raw_text = html_to_text(html)
     debug_print(f"[dynamic] Raw text length for {url}: {len(raw_text)}")
 
-    lines = [ln.strip() for ln in raw_text.splitlines() if ln.strip()]
-    text = "\n".join(lines)
-    text = normalize_whitespace(text)
+    # The extractors only ever see single-spaced text, so collapse every
+    # whitespace run (newlines included) in one pass.
+    text = normalize_whitespace(raw_text)
 
     debug_print(f"[dynamic] Normalized text length for {url}: {len(text)}")
     return text
@@ -161,50 +218,58 @@ def fetch_rendered_text(url: str) -> Optional[str]:
 # APARTMENT EXTRACTION - Site-specific extractors
 # =============================================================================
 
+# Building names some extractors look for verbatim. Each list is matched
+# with one case-insensitive alternation, i.e. a single scan of the page,
+# instead of lowercasing the whole page once per name.
+NYCHDC_BUILDINGS = [
+    "Riverwalk Park", "The Balton", "One East Harlem",
+    "Bronx Point", "Van Dyke", "The Carolina", "Coney Island Associates"
+]
+NYCHDC_BUILDINGS_RE = re.compile("|".join(map(re.escape, NYCHDC_BUILDINGS)), re.IGNORECASE)
+
+AHG_BUILDINGS = ["Abington House", "The Easton", "451 Tenth Avenue", "553W30"]
+AHG_BUILDINGS_RE = re.compile("|".join(map(re.escape, AHG_BUILDINGS)), re.IGNORECASE)
+
+
+def squash(text: str) -> str:
+    """Lowercase and drop spaces, for sites that space names inconsistently."""
+    return text.lower().replace(" ", "")
+
+
+# Spring and TFC names are compared with spaces ignored, so these
+# alternations are built from, and run over, squash()ed text.
+SPRING_BUILDINGS = ["1488 New York Avenue", "321 E 60th Street", "RADROC", "THE BEDFORD"]
+SPRING_BUILDINGS_RE = re.compile("|".join(re.escape(squash(b)) for b in SPRING_BUILDINGS))
+
+TFC_BUILDINGS = [
+    "5203 Center Blvd", "455 W 37th St", "595 Dean St",
+    "5241 Center Blvd"
+]
+TFC_BUILDINGS_RE = re.compile("|".join(re.escape(squash(b)) for b in TFC_BUILDINGS))
+
+
+def find_known_names(pattern: re.Pattern, names: list, text: str, key=str.lower) -> Set[str]:
+    """
+    Return the entries of names that pattern (their alternation) finds in
+    text. key maps a name and a matched string to the same form.
+    """
+    found = {key(m.group()) for m in pattern.finditer(text)}
+    return {name for name in names if key(name) in found}
+
+
 def extract_apartment_ids(text: str, url: str) -> Set[str]:
     """Route to site-specific extractors based on domain."""
     
     # Normalize encoding issues
-    text = text.replace("Â", " ").replace("\u00a0", " ")
-    text = re.sub(r"\s+", " ", text)
-    
-    if "iaffordny.com" in url or "afny.org" in url:
-        return extract_ids_iafford_afny(text)
-    if "residenewyork.com" in url:
-        return extract_ids_reside(text)
-    if "mgnyconsulting.com" in url:
-        return extract_ids_mgny(text)
-    if "fifthave.org" in url:
-        return extract_ids_fifthave(text)
-    if "cgmrcompliance.com" in url:
-        return extract_ids_cgm(text)
-    if "clintonmanagement.com" in url:
-        return extract_ids_clinton(text)
-    if "nyc.gov" in url:
-        return set()  # This is a directory page, not listings
-    if "nychdc.com" in url:
-        return extract_ids_nychdc(text)
-    if "prontohousingrentals.com" in url:
-        return extract_ids_pronto(text)
-    if "ahgleasing.com" in url:
-        return extract_ids_ahg(text)
-    if "sjpny.com" in url:
-        return extract_ids_sjp(text)
-    if "langsampropertyservices.com" in url:
-        return extract_ids_langsam(text)
-    if "springmanagement.net" in url:
-        return extract_ids_spring(text)
-    if "sbmgmt.sitemanager.rentmanager.com" in url:
-        return extract_ids_reclaim(text)
-    if "tfc.com" in url:
-        return extract_ids_tfc(text)
-    if "wavecrestrentals.com" in url:
-        return extract_ids_wavecrest(text)
-    if "riseboro.org" in url:
-        return extract_ids_riseboro(text)
-
-    # Generic fallback
-    return extract_ids_generic(text)
+    text = normalize_whitespace(text.replace("Â", " "))
+    
+    match = SITE_EXTRACTOR_RE.search(urlparse(url).netloc)
+    if match is None:
+        return extract_ids_generic(text)
+    extractor = SITE_EXTRACTORS[match.lastgroup]
+    if extractor is None:
+        return set()  # Directory page, not listings
+    return extractor(text)
 
 
 def extract_ids_iafford_afny(text: str) -> Set[str]:
@@ -237,7 +302,7 @@ def extract_ids_iafford_afny(text: str) -> Set[str]:
         else:
             apt_id = address
         # Clean up
-        apt_id = re.sub(r'\s+', ' ', apt_id).strip()
+        apt_id = WHITESPACE_RE.sub(' ', apt_id).strip()
         if len(apt_id) >= 10:  # Reasonable minimum
             apartments.add(apt_id)
     
@@ -263,7 +328,7 @@ def extract_ids_iafford_afny(text: str) -> Set[str]:
         address = match.group(1).strip()
         unit = match.group(2)
         apt_id = f"{address} Unit {unit}"
-        apt_id = re.sub(r'\s+', ' ', apt_id).strip()
+        apt_id = WHITESPACE_RE.sub(' ', apt_id).strip()
         apartments.add(apt_id)
 
     debug_print(f"[dynamic] iafford/afny extracted {len(apartments)} ids")
@@ -292,7 +357,7 @@ def extract_ids_reside(text: str) -> Set[str]:
         address = match.group(1).strip()
         unit = match.group(2).upper()
         apt_id = f"{address} - Unit {unit}"
-        apartments.add(re.sub(r'\s+', ' ', apt_id))
+        apartments.add(WHITESPACE_RE.sub(' ', apt_id))
     
     # Pattern 2: "Building | Address - Unit X"
     pattern2 = re.compile(
@@ -304,7 +369,7 @@ def extract_ids_reside(text: str) -> Set[str]:
         addr = match.group(2).strip()
         unit = match.group(3).upper()
         apt_id = f"{name} | {addr} - Unit {unit}"
-        apartments.add(re.sub(r'\s+', ' ', apt_id))
+        apartments.add(WHITESPACE_RE.sub(' ', apt_id))
     
     debug_print(f"[dynamic] ResideNY extracted {len(apartments)} ids")
     return apartments
@@ -327,7 +392,7 @@ def extract_ids_mgny(text: str) -> Set[str]:
     
     for match in pattern.finditer(text):
         address = match.group(1).strip()
-        address = re.sub(r'\s+', ' ', address)
+        address = WHITESPACE_RE.sub(' ', address)
         if len(address) >= 10:
             apartments.add(address)
     
@@ -363,7 +428,7 @@ def extract_ids_fifthave(text: str) -> Set[str]:
         building = match.group(1).strip()
         unit = match.group(2)
         apt_id = f"{building} Unit {unit}"
-        apartments.add(re.sub(r'\s+', ' ', apt_id))
+        apartments.add(WHITESPACE_RE.sub(' ', apt_id))
     
     # Pattern 2: "3 Eleven 11th Avenue ... Unit 617" (number + word name)
     pattern2 = re.compile(
@@ -374,7 +439,7 @@ def extract_ids_fifthave(text: str) -> Set[str]:
         building = match.group(1).strip()
         unit = match.group(2)
         apt_id = f"{building} Unit {unit}"
-        apartments.add(re.sub(r'\s+', ' ', apt_id))
+        apartments.add(WHITESPACE_RE.sub(' ', apt_id))
     
     # Pattern 3: Simple "Address ... Unit X"
     pattern3 = re.compile(
@@ -385,7 +450,7 @@ def extract_ids_fifthave(text: str) -> Set[str]:
         addr = match.group(1).strip()
         unit = match.group(2)
         apt_id = f"{addr} Unit {unit}"
-        apt_id = re.sub(r'\s+', ' ', apt_id)
+        apt_id = WHITESPACE_RE.sub(' ', apt_id)
         apartments.add(apt_id)
     
     debug_print(f"[dynamic] fifthave extracted {len(apartments)} ids")
@@ -397,7 +462,8 @@ def extract_ids_cgm(text: str) -> Set[str]:
     apartments: Set[str] = set()
     
     # If the page mentions SRO units available
-    if "SRO" in text.upper() and "available" in text.lower():
+    lower = text.lower()
+    if "sro" in lower and "available" in lower:
         apartments.add("SRO Units Available")
     
     # Look for any address patterns
@@ -461,18 +527,30 @@ def extract_ids_nychdc(text: str) -> Set[str]:
         apartments.add(apt_id)
     
     # Also look for specific building names we know
-    known_buildings = [
-        "Riverwalk Park", "The Balton", "One East Harlem", 
-        "Bronx Point", "Van Dyke", "The Carolina", "Coney Island Associates"
-    ]
-    for building in known_buildings:
-        if building.lower() in text.lower():
-            apartments.add(building)
+    apartments.update(find_known_names(NYCHDC_BUILDINGS_RE, NYCHDC_BUILDINGS, text))
     
     debug_print(f"[dynamic] nychdc extracted {len(apartments)} ids")
     return apartments
 
 
+PRONTO_BUILDINGS = [
+    ("VIA Phase II", r"VIA Phase II"),
+    ("The Larstrand", r"The Larstrand"),
+    ("Hoyt & Horn", r"Hoyt & Horn"),
+    ("Alexander Crossing", r"Alexander Crossing"),
+    ("7W21", r"7W21|7 West 21st"),
+    ("Caesura", r"Caesura"),
+    ("EOS Phase II", r"E[OŌ]S Phase II"),
+    ("SVEN", r"SVEN"),
+]
+# One scan for all buildings; the named group that matched (b0, b1, ...)
+# is the building's index in PRONTO_BUILDINGS.
+PRONTO_BUILDINGS_RE = re.compile(
+    "|".join(f"(?P<b{i}>{pattern})" for i, (_, pattern) in enumerate(PRONTO_BUILDINGS)),
+    re.IGNORECASE,
+)
+
+
 def extract_ids_pronto(text: str) -> Set[str]:
     """
     Pronto Housing: Extract building names and unit numbers.
@@ -482,20 +560,8 @@ def extract_ids_pronto(text: str) -> Set[str]:
     apartments: Set[str] = set()
     
     # Building names with addresses
-    buildings = [
-        ("VIA Phase II", r"VIA Phase II"),
-        ("The Larstrand", r"The Larstrand"),
-        ("Hoyt & Horn", r"Hoyt & Horn"),
-        ("Alexander Crossing", r"Alexander Crossing"),
-        ("7W21", r"7W21|7 West 21st"),
-        ("Caesura", r"Caesura"),
-        ("EOS Phase II", r"E[OŌ]S Phase II"),
-        ("SVEN", r"SVEN"),
-    ]
-    
-    for name, pattern in buildings:
-        if re.search(pattern, text, re.IGNORECASE):
-            apartments.add(name)
+    for match in PRONTO_BUILDINGS_RE.finditer(text):
+        apartments.add(PRONTO_BUILDINGS[int(match.lastgroup[1:])][0])
     
     # Also extract specific unit numbers like "04E", "07A", "1809"
     unit_pattern = re.compile(r'\b(\d{2,4}[A-Z]?)\s*-?\s*(?:\d+%|studio|bedroom)', re.IGNORECASE)
@@ -529,10 +595,7 @@ def extract_ids_ahg(text: str) -> Set[str]:
         apartments.add(apt_id)
     
     # Known buildings
-    known = ["Abington House", "The Easton", "451 Tenth Avenue", "553W30"]
-    for building in known:
-        if building.lower() in text.lower():
-            apartments.add(building)
+    apartments.update(find_known_names(AHG_BUILDINGS_RE, AHG_BUILDINGS, text))
     
     debug_print(f"[dynamic] ahg extracted {len(apartments)} ids")
     return apartments
@@ -604,10 +667,7 @@ def extract_ids_spring(text: str) -> Set[str]:
     apartments: Set[str] = set()
     
     # Known buildings
-    known = ["1488 New York Avenue", "321 E 60th Street", "RADROC", "THE BEDFORD"]
-    for building in known:
-        if building.lower().replace(" ", "") in text.lower().replace(" ", ""):
-            apartments.add(building)
+    apartments.update(find_known_names(SPRING_BUILDINGS_RE, SPRING_BUILDINGS, squash(text), key=squash))
     
     debug_print(f"[dynamic] spring extracted {len(apartments)} ids")
     return apartments
@@ -639,13 +699,7 @@ def extract_ids_tfc(text: str) -> Set[str]:
     apartments: Set[str] = set()
     
     # Known TFC buildings
-    known = [
-        "5203 Center Blvd", "455 W 37th St", "595 Dean St", 
-        "5241 Center Blvd"
-    ]
-    for building in known:
-        if building.lower().replace(" ", "") in text.lower().replace(" ", ""):
-            apartments.add(building)
+    apartments.update(find_known_names(TFC_BUILDINGS_RE, TFC_BUILDINGS, squash(text), key=squash))
     
     # Pattern: Address followed by building info
     pattern = re.compile(
@@ -668,10 +722,11 @@ def extract_ids_wavecrest(text: str) -> Set[str]:
     apartments: Set[str] = set()
     
     # They indicate status with text
-    if "currently not accepting" in text.lower():
+    lower = text.lower()
+    if "currently not accepting" in lower:
         return set()  # No listings available
     
-    if "accepting applications" in text.lower() or "available" in text.lower():
+    if "accepting applications" in lower or "available" in lower:
         apartments.add("Wavecrest Units Available")
     
     debug_print(f"[dynamic] wavecrest extracted {len(apartments)} ids")
@@ -684,10 +739,11 @@ def extract_ids_riseboro(text: str) -> Set[str]:
     """
     apartments: Set[str] = set()
     
-    if "accepting applications" in text.lower():
+    lower = text.lower()
+    if "accepting applications" in lower:
         apartments.add("Woodlawn Senior Living - Accepting Applications")
     
-    if "section 8" in text.lower() or "section-8" in text.lower():
+    if "section 8" in lower or "section-8" in lower:
         apartments.add("Section 8 Units")
     
     debug_print(f"[dynamic] riseboro extracted {len(apartments)} ids")
@@ -722,6 +778,62 @@ def extract_ids_generic(text: str) -> Set[str]:
     return apartments
 
 
+# Domain -> extractor dispatch for extract_apartment_ids: one search over the
+# URL's host instead of a chain of substring checks, so a domain named in a
+# path or query string never picks the extractor.
+SITE_EXTRACTOR_RE = re.compile(
+    r"(?P<iafford_afny>iaffordny\.com|afny\.org)"
+    r"|(?P<reside>residenewyork\.com)"
+    r"|(?P<mgny>mgnyconsulting\.com)"
+    r"|(?P<fifthave>fifthave\.org)"
+    r"|(?P<cgm>cgmrcompliance\.com)"
+    r"|(?P<clinton>clintonmanagement\.com)"
+    r"|(?P<nycgov>nyc\.gov)"
+    r"|(?P<nychdc>nychdc\.com)"
+    r"|(?P<pronto>prontohousingrentals\.com)"
+    r"|(?P<ahg>ahgleasing\.com)"
+    r"|(?P<sjp>sjpny\.com)"
+    r"|(?P<langsam>langsampropertyservices\.com)"
+    r"|(?P<spring>springmanagement\.net)"
+    r"|(?P<reclaim>sbmgmt\.sitemanager\.rentmanager\.com)"
+    r"|(?P<tfc>tfc\.com)"
+    r"|(?P<wavecrest>wavecrestrentals\.com)"
+    r"|(?P<riseboro>riseboro\.org)"
+)
+SITE_EXTRACTORS = {
+    "iafford_afny": extract_ids_iafford_afny,
+    "reside": extract_ids_reside,
+    "mgny": extract_ids_mgny,
+    "fifthave": extract_ids_fifthave,
+    "cgm": extract_ids_cgm,
+    "clinton": extract_ids_clinton,
+    "nycgov": None,
+    "nychdc": extract_ids_nychdc,
+    "pronto": extract_ids_pronto,
+    "ahg": extract_ids_ahg,
+    "sjp": extract_ids_sjp,
+    "langsam": extract_ids_langsam,
+    "spring": extract_ids_spring,
+    "reclaim": extract_ids_reclaim,
+    "tfc": extract_ids_tfc,
+    "wavecrest": extract_ids_wavecrest,
+    "riseboro": extract_ids_riseboro,
+}
+
+
+# is_valid_apartment_id runs on every stored and extracted id each run, so
+# its UI-text blocklist is one case-insensitive alternation rather than a
+# lowercase copy plus a substring scan per phrase.
+UI_TEXT = [
+    'per month', 'view property', 'click here', 'more info',
+    'apply now', 'learn more', 'read more', 'view advertisement',
+    'summary', 'details', 'download', 'contact'
+]
+UI_TEXT_RE = re.compile("|".join(map(re.escape, UI_TEXT)), re.IGNORECASE)
+DIGIT_RE = re.compile(r'\d')
+BUILDING_NAME_RE = re.compile(r'^(?:The\s+)?[A-Z][a-z]+')
+
+
 def is_valid_apartment_id(apt_id: str) -> bool:
     """
     Validate apartment ID - more permissive than before.
@@ -734,19 +846,12 @@ def is_valid_apartment_id(apt_id: str) -> bool:
         return False
     
     # Reject obvious UI text
-    ui_text = [
-        'per month', 'view property', 'click here', 'more info', 
-        'apply now', 'learn more', 'read more', 'view advertisement',
-        'summary', 'details', 'download', 'contact'
-    ]
-    apt_lower = apt_id.lower()
-    for ui in ui_text:
-        if ui in apt_lower:
-            return False
+    if UI_TEXT_RE.search(apt_id):
+        return False
     
     # Must have either a digit OR be a known building name pattern
-    has_digit = bool(re.search(r'\d', apt_id))
-    is_building_name = bool(re.match(r'^(?:The\s+)?[A-Z][a-z]+', apt_id))
+    has_digit = bool(DIGIT_RE.search(apt_id))
+    is_building_name = bool(BUILDING_NAME_RE.match(apt_id))
     
     if not has_digit and not is_building_name:
         return False
@@ -771,36 +876,72 @@ def format_apartment_changes(added: Set[str], removed: Set[str]) -> str:
     return "\n".join(lines)
 
 
-def send_ntfy_alert(url: str, summary: str, priority: str = "3") -> None:
-    if not summary.strip():
-        return
-
-    if not NTFY_TOPIC_URL:
-        print("[WARN] NTFY_TOPIC_URL not set, would have sent:")
-        print(summary)
-        return
-
-    body = f"{url}\n\n{summary}"
-    headers = {
-        "Title": "Housing listings updated",
-        "Priority": priority,
-        "Tags": "housing,monitor",
-        "Click": url,
-    }
-
+def post_ntfy(body: str, headers: Dict[str, str], label: str) -> None:
     try:
-        resp = requests.post(
+        resp = SESSION.post(
             NTFY_TOPIC_URL,
             data=body.encode("utf-8"),
             headers=headers,
             timeout=20,
         )
         if 200 <= resp.status_code < 300:
-            print(f"[OK] ntfy alert sent for {url}")
+            print(f"[OK] ntfy alert sent for {label}")
         else:
-            print(f"[ERROR] ntfy returned {resp.status_code} for {url}")
+            print(f"[ERROR] ntfy returned {resp.status_code} for {label}")
     except Exception as e:
-        print(f"[ERROR] Sending ntfy alert for {url}: {e}")
+        print(f"[ERROR] Sending ntfy alert for {label}: {e}")
+
+
+def send_ntfy_alerts(alerts: list) -> None:
+    """
+    Send the (url, summary, priority) alerts collected during a run. One
+    alert keeps its own priority and Click link; several go out as one
+    message at the highest priority among them, split to stay under
+    ntfy's message size limit.
+    """
+    alerts = [a for a in alerts if a[1].strip()]
+    if not alerts:
+        return
+
+    if not NTFY_TOPIC_URL:
+        print("[WARN] NTFY_TOPIC_URL not set, would have sent:")
+        for url, summary, _ in alerts:
+            print(f"{url}\n{summary}")
+        return
+
+    if len(alerts) == 1:
+        url, summary, priority = alerts[0]
+        headers = {
+            "Title": "Housing listings updated",
+            "Priority": priority,
+            "Tags": "housing,monitor",
+            "Click": url,
+        }
+        post_ntfy(f"{url}\n\n{summary}", headers, url)
+        return
+
+    batches: list = [[]]
+    size = 0
+    for alert in alerts:
+        url, summary, _ = alert
+        entry_size = len(f"{url}\n\n{summary}".encode("utf-8")) + len(NTFY_SEPARATOR)
+        if batches[-1] and size + entry_size > NTFY_MAX_BYTES:
+            batches.append([])
+            size = 0
+        batches[-1].append(alert)
+        size += entry_size
+
+    for i, batch in enumerate(batches, 1):
+        title = f"Housing listings updated: {len(batch)} sites"
+        if len(batches) > 1:
+            title += f" ({i}/{len(batches)})"
+        headers = {
+            "Title": title,
+            "Priority": max(priority for _, _, priority in batch),
+            "Tags": "housing,monitor",
+        }
+        body = NTFY_SEPARATOR.join(f"{url}\n\n{summary}" for url, summary, _ in batch)
+        post_ntfy(body, headers, f"{len(batch)} sites")
 
 
 # =============================================================================
@@ -843,8 +984,18 @@ DYNAMIC_URLS = [
 
 
 def run_dynamic_once() -> None:
-    text_state = load_json(TEXT_FILE)
+    if sync_playwright is None:
+        print("[ERROR] playwright not installed, can't fetch dynamic pages")
+        return
+
+    # The rendered page text is never read back by the monitor; it is only
+    # kept, under DEBUG, to see what the extractors were given.
+    text_state = load_json(TEXT_FILE) if DEBUG else {}
     apt_state_raw = load_json(APT_FILE)
+    failures = load_json(FAILURE_FILE)
+    cooldowns = load_json(COOLDOWN_FILE)
+    cooldowns_before = dict(cooldowns)
+    failures_changed = False
     
     # Deduplicate and validate existing state
     apt_state: Dict[str, list] = {}
@@ -856,62 +1007,94 @@ def run_dynamic_once() -> None:
     print(f"[INFO] Loaded state for {len(apt_state)} URLs")
 
     changed_any = False
+    # Collected during the run and sent together at the end.
+    alerts: list = []
+
+    # Clear leftovers from earlier runs once, before any browser starts;
+    # doing it per fetch would delete profiles the other workers still use.
+    cleanup_playwright_tmp()
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        futures = {}
+        # Each listing costs a full browser render; never do one twice.
+        for url in dict.fromkeys(DYNAMIC_URLS):
+            wait = cooldown_seconds(cooldowns, url)
+            if wait > 0:
+                print(f"[COOLDOWN] {url} on cooldown for {int(wait)}s, skipping")
+                track_failure(failures, url)
+                failures_changed = True
+                continue
+            futures[url] = pool.submit(fetch_rendered_text, url)
+
+        # Handle results in list order rather than completion order so the
+        # log and the batched alert read the same way every run; the
+        # fetches themselves still overlap.
+        for url, future in futures.items():
+            print(f"[INFO] Checking {url}")
+            text = future.result()
+            if text is None:
+                track_failure(failures, url)
+                failures_changed = True
+                set_cooldown(cooldowns, url, 300)
+                continue
+
+            if reset_failure_count(failures, url):
+                failures_changed = True
+
+            new_apartments_raw = extract_apartment_ids(text, url)
+            new_apartments = {a for a in new_apartments_raw if is_valid_apartment_id(a)}
+        
+            print(f"[INFO] {url}: extracted {len(new_apartments)} apartments")
+            if DEBUG and new_apartments:
+                for apt in sorted(new_apartments)[:5]:
+                    print(f"  - {apt}")
 
-    for url in DYNAMIC_URLS:
-        print(f"[INFO] Checking {url}")
-        text = fetch_rendered_text(url)
-        if text is None:
-            track_failure(url)
-            continue
+            old_list = apt_state.get(url, [])
+            old_apartments = set(old_list)
 
-        reset_failure_count(url)
+            if not old_apartments:
+                print(f"[INIT] Baseline for {url}: {len(new_apartments)} units")
+                apt_state[url] = sorted(new_apartments)
+                text_state[url] = text
+                changed_any = True
+                continue
 
-        new_apartments_raw = extract_apartment_ids(text, url)
-        new_apartments = {a for a in new_apartments_raw if is_valid_apartment_id(a)}
-        
-        print(f"[INFO] {url}: extracted {len(new_apartments)} apartments")
-        if DEBUG and new_apartments:
-            for apt in sorted(new_apartments)[:5]:
-                print(f"  - {apt}")
+            added = new_apartments - old_apartments
+            removed = old_apartments - new_apartments
 
-        old_list = apt_state.get(url, [])
-        old_apartments = set(old_list)
+            if not added and not removed:
+                print(f"[NOCHANGE] {url}")
+                continue
 
-        if not old_apartments:
-            print(f"[INIT] Baseline for {url}: {len(new_apartments)} units")
-            apt_state[url] = sorted(new_apartments)
-            text_state[url] = text
-            changed_any = True
-            continue
+            # Skip massive changes (likely extractor instability)
+            if len(added) > 25 or len(removed) > 25:
+                print(f"[SKIP] {url}: Massive change (+{len(added)} / -{len(removed)}) - likely noise")
+                continue
 
-        added = new_apartments - old_apartments
-        removed = old_apartments - new_apartments
+            print(f"[CHANGE] {url}: +{len(added)} / -{len(removed)}")
 
-        if not added and not removed:
-            print(f"[NOCHANGE] {url}")
-            continue
+            summary = format_apartment_changes(added, removed)
 
-        # Skip massive changes (likely extractor instability)
-        if len(added) > 25 or len(removed) > 25:
-            print(f"[SKIP] {url}: Massive change (+{len(added)} / -{len(removed)}) - likely noise")
-            continue
+            if added and summary:
+                alerts.append((url, summary, "4"))
+            elif len(removed) > 3 and summary:
+                alerts.append((url, summary, "2"))
 
-        print(f"[CHANGE] {url}: +{len(added)} / -{len(removed)}")
-
-        summary = format_apartment_changes(added, removed)
+            apt_state[url] = sorted(new_apartments)
+            text_state[url] = text
+            changed_any = True
 
-        if added and summary:
-            send_ntfy_alert(url, summary, priority="4")
-        elif len(removed) > 3 and summary:
-            send_ntfy_alert(url, summary, priority="2")
+    send_ntfy_alerts(alerts)
 
-        apt_state[url] = sorted(new_apartments)
-        text_state[url] = text
-        changed_any = True
+    if failures_changed:
+        save_json(FAILURE_FILE, failures)
+    if cooldowns != cooldowns_before:
+        save_json(COOLDOWN_FILE, cooldowns)
 
     if changed_any:
         save_json(APT_FILE, apt_state)
-        save_json(TEXT_FILE, text_state)
+        if DEBUG:
+            save_json(TEXT_FILE, text_state)
         print(f"[INFO] State saved. URLs tracked: {len(apt_state)}")
     else:
         print("[INFO] No changes to save.")